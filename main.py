@@ -1,16 +1,93 @@
 import streamlit as st
-from phi.tools.youtube_tools import YouTubeTools
-from langchain_groq import ChatGroq
 from textwrap import dedent
-from dotenv import load_dotenv
+import asyncio
+import concurrent.futures
+import hashlib
+import itertools
 import os
-
-load_dotenv()
-groq_api_key = os.getenv("GROQ_API_KEY")
-
-# Initialize Groq client
-client = ChatGroq(api_key=groq_api_key)
-
+import re
+import sqlite3
+import threading
+import time
+
+# Upper bound on concurrent chunk requests, keeps us clear of Groq rate limits
+MAX_CONCURRENT_CHUNKS = 8
+
+# Videos offered in the sidebar, their metadata is prefetched when a session starts
+TRENDING_VIDEOS = {
+    "Intro to Large Language Models": "https://youtu.be/zjkBMFhNj_g",
+    "What's next for AI agents": "https://youtu.be/pBBe1pk8hf4",
+    "Making AI accessible": "https://youtu.be/c3b-JASoPi0",
+}
+
+# Context window of each model, in tokens
+MODEL_CTX = {
+    "llama3-8b-8192": 8192,
+    "mixtral-8x7b-32768": 32768,
+    "llama3-70b-8192": 8192,
+}
+
+# Conservative tokens-per-word estimate for English captions
+TOKENS_PER_WORD = 1.4
+
+# Tokens reserved in every single-call prompt for the answer and for the
+# instructions, URL and separators around the captions or summaries
+MAX_OUTPUT_TOKENS = 2048
+PROMPT_OVERHEAD_TOKENS = 300
+VIDEO_DATA_WORDS = 200
+
+# Messages phi's YouTubeTools returns in place of data when a lookup fails
+YOUTUBE_ERROR_PREFIXES = (
+    "No URL provided",
+    "Error getting video ID from URL",
+    "Error getting video data",
+    "Error getting captions for video",
+    "No captions found for video",
+)
+
+# Characters of the transcript shown in the page, the full text stays server-side
+CAPTIONS_PREVIEW_CHARS = 2000
+
+# Word budget for the final report, split evenly across chunk summaries
+FINAL_SUMMARY_WORDS = 1200
+MIN_CHUNK_SUMMARY_WORDS = 80
+
+# How long a caller waits on another session's identical request before taking it over
+INFLIGHT_WAIT_SECONDS = 120
+
+# Chunk summaries are merged pairwise until at most this many feed the final report
+FINAL_MERGE_FANIN = 4
+
+# On-disk cache of LLM responses, keyed on (model, prompt)
+RESPONSE_CACHE_PATH = os.path.join(os.path.expanduser("~"), ".cache", "yt_summary.db")
+RESPONSE_CACHE_TTL = 86400
+
+# Report format appended to the system prompt, dedented once at import
+SYSTEM_PROMPT = dedent(
+    """
+    <report_format>
+    ## Video Title with Link
+    {this is the markdown link to the video}
+
+    ### Overview
+    {give a brief introduction of the video and why the user should read this report}
+    {make this section engaging and create a hook for the reader}
+
+    ### Section 1
+    {break the report into sections}
+    {provide details/facts/processes in this section}
+
+    ... more sections as necessary...
+
+    ### Takeaways
+    {provide key takeaways from the video}
+
+    Report generated on: {Month Date, Year (hh:mm AM/PM)}
+    </report_format>
+    """
+)
+
+@st.cache_resource
 def get_video_summarizer(model: str = "llama3-8b-8192", debug_mode: bool = True) -> dict:
     return {
         "model": model,
@@ -27,29 +104,7 @@ def get_video_summarizer(model: str = "llama3-8b-8192", debug_mode: bool = True)
             "Give relevant titles to sections and provide details/facts/processes in each section.",
             "REMEMBER: you are writing for the New York Times, so the quality of the report is important.",
         ],
-        "add_to_system_prompt": dedent(
-            """
-            <report_format>
-            ## Video Title with Link
-            {this is the markdown link to the video}
-
-            ### Overview
-            {give a brief introduction of the video and why the user should read this report}
-            {make this section engaging and create a hook for the reader}
-
-            ### Section 1
-            {break the report into sections}
-            {provide details/facts/processes in this section}
-
-            ... more sections as necessary...
-
-            ### Takeaways
-            {provide key takeaways from the video}
-
-            Report generated on: {Month Date, Year (hh:mm AM/PM)}
-            </report_format>
-            """
-        ),
+        "add_to_system_prompt": SYSTEM_PROMPT,
         "markdown": True,
         "add_datetime_to_instructions": True,
         "debug_mode": debug_mode,
@@ -59,6 +114,455 @@ def get_video_summarizer(model: str = "llama3-8b-8192", debug_mode: bool = True)
 def truncate_text(text: str, words: int) -> str:
     return " ".join(text.split()[:words])
 
+def count_words(text: str) -> int:
+    return sum(1 for _ in re.finditer(r"\S+", text))
+
+# Words of input that fit in one call to `model` once output and prompt text are reserved
+def input_word_budget(model: str, default: int) -> int:
+    ctx = MODEL_CTX.get(model)
+    if ctx is None:
+        return default
+    return int((ctx - MAX_OUTPUT_TOKENS - PROMPT_OVERHEAD_TOKENS) / TOKENS_PER_WORD)
+
+# Yield chunks of at most `words` words, sliced straight from the original text
+def iter_chunks(text: str, words: int):
+    tokens = re.finditer(r"\S+", text)
+    while True:
+        chunk = list(itertools.islice(tokens, words))
+        if not chunk:
+            break
+        yield text[chunk[0].start() : chunk[-1].end()]
+
+# Heavy dependencies below are imported on first use and then held for the process
+
+# Groq API key, read from the environment (and .env) once per process
+@st.cache_resource
+def get_groq_api_key() -> str:
+    from dotenv import load_dotenv
+
+    load_dotenv()
+    return os.getenv("GROQ_API_KEY")
+
+# Groq client, created once per process
+@st.cache_resource
+def get_client():
+    from groq import Groq
+
+    return Groq(api_key=get_groq_api_key())
+
+# YouTube tools instance, created once per process
+@st.cache_resource
+def get_yt_tools():
+    from phi.tools.youtube_tools import YouTubeTools
+
+    return YouTubeTools(languages=["en"])
+
+# Shared worker pool for blocking YouTube fetches
+@st.cache_resource
+def get_executor() -> concurrent.futures.ThreadPoolExecutor:
+    return concurrent.futures.ThreadPoolExecutor(max_workers=4)
+
+# YouTubeTools reports failures as strings rather than raising
+def check_youtube_result(result: str) -> str:
+    if not result or result.startswith(YOUTUBE_ERROR_PREFIXES):
+        raise ValueError(result or "Empty response from YouTube")
+    return result
+
+# Video metadata and captions are cached by URL so reruns skip the YouTube round-trip.
+# Failures raise, so st.cache_data stores nothing and the next run tries again.
+@st.cache_data(ttl=3600, show_spinner=False)
+def fetch_video_data(url: str) -> str:
+    return check_youtube_result(get_yt_tools().get_youtube_video_data(url))
+
+@st.cache_data(ttl=3600, show_spinner=False)
+def fetch_captions(url: str) -> str:
+    return check_youtube_result(get_yt_tools().get_youtube_video_captions(url))
+
+# Reuse a pending or finished fetch, resubmit one that failed
+def reuse_or_submit(future, fetch, url: str) -> concurrent.futures.Future:
+    if future is None or (future.done() and future.exception() is not None):
+        return get_executor().submit(fetch, url)
+    return future
+
+# SQLite connection for the response cache, opened once per process.
+# Every session thread shares it, so all access goes through the lock.
+@st.cache_resource
+def get_response_cache() -> tuple:
+    os.makedirs(os.path.dirname(RESPONSE_CACHE_PATH), exist_ok=True)
+    conn = sqlite3.connect(RESPONSE_CACHE_PATH, check_same_thread=False)
+    conn.execute(
+        "CREATE TABLE IF NOT EXISTS responses (key TEXT PRIMARY KEY, content TEXT, created REAL)"
+    )
+    conn.execute("CREATE INDEX IF NOT EXISTS responses_created ON responses (created)")
+    conn.commit()
+    return conn, threading.Lock()
+
+def hash_request(prompt: str, model: str) -> str:
+    return hashlib.sha256(f"{model}\n{prompt}".encode("utf-8")).hexdigest()
+
+# Cache failures (including an unusable cache path) are treated as a miss,
+# they must never cost us an LLM result
+def cache_get(key: str):
+    try:
+        conn, lock = get_response_cache()
+        with lock:
+            row = conn.execute(
+                "SELECT content, created FROM responses WHERE key = ?", (key,)
+            ).fetchone()
+    except (OSError, sqlite3.Error):
+        return None
+    if row is not None and time.time() - row[1] < RESPONSE_CACHE_TTL:
+        return row[0]
+    return None
+
+# Store a response and drop the ones that have expired
+def cache_set(key: str, content: str) -> None:
+    now = time.time()
+    try:
+        conn, lock = get_response_cache()
+        with lock, conn:
+            conn.execute("DELETE FROM responses WHERE created < ?", (now - RESPONSE_CACHE_TTL,))
+            conn.execute(
+                "INSERT OR REPLACE INTO responses (key, content, created) VALUES (?, ?, ?)",
+                (key, content, now),
+            )
+    except (OSError, sqlite3.Error):
+        pass
+
+# Groq requests currently in flight, shared by every session in the process
+@st.cache_resource
+def get_inflight() -> tuple:
+    return {}, threading.Lock()
+
+# Become the leader for `key`, or join the request another caller already started.
+# Passing the `stale` future of a leader that stopped answering takes its place.
+# The future is marked running straight away so no follower can cancel it for everyone.
+def claim_inflight(key: str, stale: concurrent.futures.Future = None) -> tuple:
+    inflight, lock = get_inflight()
+    with lock:
+        future = inflight.get(key)
+        if future is not None and future is not stale:
+            return future, False
+        future = concurrent.futures.Future()
+        future.set_running_or_notify_cancel()
+        inflight[key] = future
+        return future, True
+
+# Hand the leader's outcome to its followers. A leader that was cancelled or
+# abandoned resolves to None, which tells followers to make the call themselves.
+def resolve_inflight(key: str, future: concurrent.futures.Future, result=None, error=None) -> None:
+    inflight, lock = get_inflight()
+    with lock:
+        if inflight.get(key) is future:
+            del inflight[key]
+    if error is not None:
+        future.set_exception(error)
+    else:
+        future.set_result(result)
+
+# Run `call` once per key, concurrent callers with the same key await the same result
+async def single_flight(key: str, call):
+    while True:
+        future, leader = claim_inflight(key)
+        if leader:
+            break
+        # Shielded, so a follower being cancelled leaves the shared future alone
+        try:
+            result = await asyncio.wait_for(
+                asyncio.shield(asyncio.wrap_future(future)), INFLIGHT_WAIT_SECONDS
+            )
+        except asyncio.TimeoutError:
+            future, leader = claim_inflight(key, stale=future)
+            if leader:
+                break
+            continue
+        if result is not None:
+            return result
+
+    try:
+        result = await call()
+    except Exception as e:
+        resolve_inflight(key, future, error=e)
+        raise
+    except BaseException:
+        resolve_inflight(key, future)
+        raise
+    resolve_inflight(key, future, result)
+    return result
+
+# Stream the LLM response, serving identical (model, prompt) requests from the disk cache.
+# While one session streams a response, others asking for it wait for the finished text.
+def stream_cached(prompt: str, model: str):
+    key = hash_request(prompt, model)
+    while True:
+        content = cache_get(key)
+        if content is not None:
+            yield content
+            return
+        future, leader = claim_inflight(key)
+        if leader:
+            break
+        try:
+            content = future.result(timeout=INFLIGHT_WAIT_SECONDS)
+        except concurrent.futures.TimeoutError:
+            future, leader = claim_inflight(key, stale=future)
+            if leader:
+                break
+            continue
+        if content is not None:
+            yield content
+            return
+
+    parts = []
+    stream = None
+    try:
+        stream = get_client().chat.completions.create(
+            model=model,
+            messages=[{"role": "user", "content": prompt}],
+            max_tokens=MAX_OUTPUT_TOKENS,
+            stream=True,
+        )
+        for chunk in stream:
+            delta = chunk.choices[0].delta.content or ""
+            parts.append(delta)
+            yield delta
+    except Exception as e:
+        resolve_inflight(key, future, error=e)
+        raise
+    except BaseException:
+        resolve_inflight(key, future)
+        raise
+    finally:
+        # Release the HTTP response even when the consumer stops reading early
+        if stream is not None:
+            stream.close()
+
+    content = "".join(parts).strip()
+    cache_set(key, content)
+    resolve_inflight(key, future, content)
+
+# Async client on the aiohttp transport, which handles many parallel calls better than httpx
+def make_async_client():
+    from groq import AsyncGroq, DefaultAioHttpClient
+
+    return AsyncGroq(api_key=get_groq_api_key(), http_client=DefaultAioHttpClient())
+
+# Summarize all chunks concurrently (map step), chunk summaries share the disk cache
+async def summarize_chunks(chunks: list, model: str) -> list:
+    sem = asyncio.Semaphore(MAX_CONCURRENT_CHUNKS)
+    target = max(MIN_CHUNK_SUMMARY_WORDS, FINAL_SUMMARY_WORDS // max(1, len(chunks)))
+
+    async with make_async_client() as async_client:
+
+        async def summarize_chunk(text: str) -> str:
+            prompt = (
+                f"Summarize the following captions into no more than {target} words, "
+                f"preserving salient facts. Respond with only the summary:\n{text}"
+            )
+            key = hash_request(prompt, model)
+            content = cache_get(key)
+            if content is not None:
+                return content
+
+            async def request() -> str:
+                async with sem:
+                    response = await async_client.chat.completions.create(
+                        model=model,
+                        messages=[{"role": "user", "content": prompt}],
+                        max_tokens=int(target * 1.5),
+                    )
+                    content = response.choices[0].message.content.strip()
+                    cache_set(key, content)
+                    return content
+
+            return await single_flight(key, request)
+
+        return await asyncio.gather(
+            *(summarize_chunk(chunk) for chunk in chunks), return_exceptions=True
+        )
+
+# Merge summaries pairwise, level by level, until at most `fanin` remain (reduce step)
+async def merge_summaries(summaries: list, model: str, fanin: int = FINAL_MERGE_FANIN) -> list:
+    sem = asyncio.Semaphore(MAX_CONCURRENT_CHUNKS)
+
+    async with make_async_client() as async_client:
+
+        async def merge(a: str, b: str) -> str:
+            prompt = (
+                "Merge the following two consecutive summaries of a video into one summary, "
+                f"preserving salient facts. Respond with only the summary:\n{a}\n\n---\n\n{b}"
+            )
+            key = hash_request(prompt, model)
+            content = cache_get(key)
+            if content is not None:
+                return content
+
+            async def request() -> str:
+                async with sem:
+                    response = await async_client.chat.completions.create(
+                        model=model, messages=[{"role": "user", "content": prompt}]
+                    )
+                    content = response.choices[0].message.content.strip()
+                    cache_set(key, content)
+                    return content
+
+            return await single_flight(key, request)
+
+        level = list(summaries)
+        while len(level) > max(1, fanin):
+            pairs = list(zip(level[0::2], level[1::2]))
+            tail = level[-1:] if len(level) % 2 else []
+            level = list(await asyncio.gather(*(merge(a, b) for a, b in pairs))) + tail
+        return level
+
+# Split captions for summarization, keeping them whole when they fit the model's context
+def split_captions(captions: str, model: str, chunk_words: int) -> list:
+    budget = input_word_budget(model, chunk_words)
+    if count_words(captions) <= input_word_budget(model, 0):
+        return [captions]
+    # No chunk may exceed what one call to the model can take
+    return list(iter_chunks(captions, min(chunk_words, budget)))
+
+# Turn failed chunk requests into readable placeholders
+def format_chunk_results(results: list) -> list:
+    return [
+        f"Error during API call: {str(result)}" if isinstance(result, Exception) else result
+        for result in results
+    ]
+
+def build_single_prompt(captions: str) -> str:
+    return f"Summarize the following video captions:\n{captions}"
+
+# Final report prompt, kept inside the model's context window
+def build_final_prompt(url: str, video_data, chunk_summaries: list, model: str, chunk_words: int) -> str:
+    summary_budget = input_word_budget(model, chunk_words) - VIDEO_DATA_WORDS
+    per_chunk = summary_budget // max(1, len(chunk_summaries))
+
+    video_info = f"Video URL: {url}\n\n"
+    video_info += f"Video Data: {truncate_text(str(video_data), VIDEO_DATA_WORDS)}\n\n"
+    video_info += "Summaries:\n\n"
+    for i, chunk_summary in enumerate(chunk_summaries, start=1):
+        video_info += f"Chunk {i}:\n\n{truncate_text(chunk_summary, per_chunk)}\n\n"
+        video_info += "---\n\n"
+    return f"Summarize the following captions:\n{video_info}"
+
+# Run the map and merge steps and return the prompt for the final report.
+# `on_chunks` receives the chunk results (summaries or exceptions) before any failure is raised.
+def build_report_prompt(url: str, video_data, chunks: list, model: str, chunk_words: int, on_chunks=None) -> str:
+    if len(chunks) == 1:
+        return build_single_prompt(chunks[0])
+
+    results = asyncio.run(summarize_chunks(chunks, model))
+    if on_chunks is not None:
+        on_chunks(results)
+
+    errors = [result for result in results if isinstance(result, Exception)]
+    if errors:
+        raise RuntimeError(f"{len(errors)} of {len(results)} chunks could not be summarized") from errors[0]
+
+    # Collapse the chunk summaries with a tree of pairwise merges
+    chunk_summaries = asyncio.run(merge_summaries(results, model))
+    return build_final_prompt(url, video_data, chunk_summaries, model, chunk_words)
+
+# Metadata only adds context to the report, so a failed lookup leaves it empty.
+# Returns the metadata and the error message, if any.
+def load_video_data(get) -> tuple:
+    try:
+        return get(), None
+    except ValueError as e:
+        return {}, str(e)
+
+# Summarize a video end to end without any Streamlit UI
+def summarize_video(url: str, model: str = "llama3-8b-8192", chunk_words: int = 4500) -> str:
+    video_data, _ = load_video_data(lambda: fetch_video_data(url))
+    video_captions = fetch_captions(url)
+    chunks = split_captions(video_captions, model, chunk_words)
+    prompt = build_report_prompt(url, video_data, chunks, model, chunk_words)
+    return "".join(stream_cached(prompt, model)).strip()
+
+# Commit a video URL and start reading its captions straight away
+def select_video(url: str) -> None:
+    st.session_state["youtube_url"] = url
+    st.session_state["captions"] = {url: get_executor().submit(fetch_captions, url)}
+
+# Render the video, captions and streamed summary for one URL
+def render(url: str, model: str, chunk_words: int) -> None:
+    video_captions = None
+    video_summarizer = get_video_summarizer(model=model)
+
+    with st.status("Parsing Video", expanded=False) as status:
+        video_container = st.empty()
+        video_container.video(url)
+
+        # Captions are already loading since the URL was selected, fetch metadata alongside
+        prefetch = st.session_state.setdefault("prefetch", {})
+        video_data_future = reuse_or_submit(prefetch.get(url), fetch_video_data, url)
+        prefetch[url] = video_data_future
+
+        video_data_container = st.empty()
+        video_data, error = load_video_data(video_data_future.result)
+        if error is None:
+            video_data_container.json(video_data)
+        else:
+            video_data_container.write(f"Could not read video data: {error}")
+        status.update(label="Video", state="complete", expanded=False)
+
+    with st.status("Reading Captions", expanded=False) as status:
+        # Only the current video's captions are kept for the session
+        captions = st.session_state.setdefault("captions", {})
+        captions_future = reuse_or_submit(captions.get(url), fetch_captions, url)
+        st.session_state["captions"] = {url: captions_future}
+        try:
+            video_captions = captions_future.result()
+        except ValueError:
+            video_captions = None
+        video_captions_container = st.empty()
+        preview = (video_captions or "")[:CAPTIONS_PREVIEW_CHARS]
+        if video_captions and len(video_captions) > CAPTIONS_PREVIEW_CHARS:
+            preview += "…"
+        video_captions_container.text(preview)
+        status.update(label="Captions processed", state="complete", expanded=False)
+
+    if not video_captions:
+        st.write("Sorry, could not parse the video. Please try again or use a different video.")
+        return
+
+    # Summarize the video captions (use summarization from the first project)
+    with st.status("Summarizing Captions", expanded=False) as status:
+        # Only the current chunks are kept, recomputed when the video, limit or model changes
+        chunks_key = f"{url}:{chunk_words}:{model}"
+        if st.session_state.get("chunks_key") != chunks_key:
+            st.session_state["chunks"] = split_captions(video_captions, model, chunk_words)
+            st.session_state["chunks_key"] = chunks_key
+        chunks = st.session_state["chunks"]
+
+        # Show each chunk summary once the map step is done
+        def show_chunks(results: list) -> None:
+            for i, chunk_summary in enumerate(format_chunk_results(results)):
+                with st.status(f"Summarizing chunk: {i+1}", expanded=False) as chunk_status:
+                    chunk_container = st.empty()
+                    chunk_container.markdown(chunk_summary)
+                    chunk_status.update(label=f"Chunk {i+1} summarized", state="complete", expanded=False)
+
+        try:
+            prompt = build_report_prompt(url, video_data, chunks, model, chunk_words, on_chunks=show_chunks)
+        except Exception as e:
+            st.write(f"Error during summary generation: {str(e)}")
+            status.update(label="Summarizing failed", state="error", expanded=True)
+            return
+
+        # Only complete once the chunk summaries are merged and the report prompt is ready
+        status.update(label="Captions summarized", state="complete", expanded=False)
+
+    # Stream the report outside the collapsed status so tokens show up as they arrive
+    with st.spinner("Generating Summary"):
+        summary_container = st.empty()
+        try:
+            summary_container.write_stream(stream_cached(prompt, model))
+        except Exception as e:
+            summary = f"Error during summary generation: {str(e)}"
+            summary_container.markdown(summary)
+
 # Main function
 def main() -> None:
     llm_model = st.sidebar.selectbox(
@@ -83,114 +587,21 @@ def main() -> None:
     video_url = st.sidebar.text_input(":video_camera: Video URL")
     generate_report = st.sidebar.button("Generate Summary")
     if generate_report:
-        st.session_state["youtube_url"] = video_url
+        select_video(video_url)
 
-    st.sidebar.markdown("## Trending Videos")
-    if st.sidebar.button("Intro to Large Language Models"):
-        st.session_state["youtube_url"] = "https://youtu.be/zjkBMFhNj_g"
+    # Warm the metadata cache for the trending videos in the background
+    if "prefetch" not in st.session_state:
+        st.session_state["prefetch"] = {
+            url: get_executor().submit(fetch_video_data, url) for url in TRENDING_VIDEOS.values()
+        }
 
-    if st.sidebar.button("What's next for AI agents"):
-        st.session_state["youtube_url"] = "https://youtu.be/pBBe1pk8hf4"
-
-    if st.sidebar.button("Making AI accessible"):
-        st.session_state["youtube_url"] = "https://youtu.be/c3b-JASoPi0"
+    st.sidebar.markdown("## Trending Videos")
+    for title, url in TRENDING_VIDEOS.items():
+        if st.sidebar.button(title):
+            select_video(url)
 
     if "youtube_url" in st.session_state:
-        _url = st.session_state["youtube_url"]
-        youtube_tools = YouTubeTools(languages=["en"])
-        video_captions = None
-        video_summarizer = get_video_summarizer(model=llm_model)
-
-        with st.status("Parsing Video", expanded=False) as status:
-            with st.container():
-                video_container = st.empty()
-                video_container.video(_url)
-
-            video_data = youtube_tools.get_youtube_video_data(_url)
-            with st.container():
-                video_data_container = st.empty()
-                video_data_container.json(video_data)
-            status.update(label="Video", state="complete", expanded=False)
-
-        with st.status("Reading Captions", expanded=False) as status:
-            video_captions = youtube_tools.get_youtube_video_captions(_url)
-            with st.container():
-                video_captions_container = st.empty()
-                video_captions_container.write(video_captions)
-            status.update(label="Captions processed", state="complete", expanded=False)
-
-        if not video_captions:
-            st.write("Sorry, could not parse the video. Please try again or use a different video.")
-            return
-
-        # Summarize the video captions (use summarization from the first project)
-        with st.status("Summarizing Captions", expanded=False) as status:
-            # Split captions into chunks if necessary
-            chunks = []
-            num_chunks = 0
-            words = video_captions.split()
-
-            # Split captions into chunks based on the slider limit
-            for i in range(0, len(words), chunker_limit):
-                num_chunks += 1
-                chunks.append(" ".join(words[i : (i + chunker_limit)]))
-
-            if num_chunks > 1:
-                chunk_summaries = []
-                for i in range(num_chunks):
-                    with st.status(f"Summarizing chunk: {i+1}", expanded=False) as status:
-                        chunk_summary = ""
-                        chunk_container = st.empty()
-                        chunk_info = f"Video data: {video_data}\n\n"
-                        chunk_info += f"{chunks[i]}\n\n"
-
-                        # Request summarization from Groq (same technique as first project)
-                        try:
-                            prompt = f"Summarize the following video captions:\n{chunks[i]}"
-                            response = client.invoke(input=prompt, model=llm_model)
-                            chunk_summary = response.content.strip()
-                        except Exception as e:
-                            chunk_summary = f"Error during API call: {str(e)}"
-
-                        chunk_container.markdown(chunk_summary)
-                        chunk_summaries.append(chunk_summary)
-                        status.update(label=f"Chunk {i+1} summarized", state="complete", expanded=False)
-
-                with st.spinner("Generating Final Summary"):
-                    summary = ""
-                    summary_container = st.empty()
-                    video_info = f"Video URL: {_url}\n\n"
-                    video_info += f"Video Data: {video_data}\n\n"
-                    video_info += "Summaries:\n\n"
-                    for i, chunk_summary in enumerate(chunk_summaries, start=1):
-                        video_info += f"Chunk {i}:\n\n{chunk_summary}\n\n"
-                        video_info += "---\n\n"
-
-                    try:
-                        prompt = f"Summarize the following captions:\n{video_info}"
-                        response = client.invoke(input=prompt, model=llm_model)
-                        summary += response.content.strip()
-                    except Exception as e:
-                        summary = f"Error during final summary generation: {str(e)}"
-
-                    summary_container.markdown(summary)
-            else:
-                with st.spinner("Generating Summary"):
-                    summary = ""
-                    summary_container = st.empty()
-                    video_info = f"Video URL: {_url}\n\n"
-                    video_info += f"Video Data: {video_data}\n\n"
-                    video_info += f"Captions: {video_captions}\n\n"
-
-                    try:
-                        prompt = f"Summarize the following video captions:\n{video_captions}"
-                        response = client.invoke(input=prompt, model=llm_model)
-                        summary += response.content.strip()
-                    except Exception as e:
-                        summary = f"Error during summary generation: {str(e)}"
-
-                    summary_container.markdown(summary)
-
+        render(st.session_state["youtube_url"], llm_model, chunker_limit)
     else:
         st.write("Please provide a video URL or click on one of the trending videos.")
 
@@ -198,4 +609,5 @@ def main() -> None:
     if st.sidebar.button("Restart"):
         st.rerun()
 
-main()
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,346 @@
+import asyncio
+import threading
+import time
+from types import SimpleNamespace
+
+import pytest
+
+pytest.importorskip("streamlit")
+
+import main
+
+
+def run_in_threads(target, count):
+    results = [None] * count
+    errors = [None] * count
+
+    def worker(i):
+        try:
+            results[i] = target(i)
+        except BaseException as e:
+            errors[i] = e
+
+    threads = [threading.Thread(target=worker, args=(i,)) for i in range(count)]
+    for thread in threads:
+        thread.start()
+        time.sleep(0.02)
+    for thread in threads:
+        thread.join(timeout=5)
+    return results, errors
+
+
+def test_single_flight_coalesces_concurrent_calls():
+    calls = []
+
+    async def call():
+        calls.append(1)
+        await asyncio.sleep(0.2)
+        return "summary"
+
+    results, errors = run_in_threads(
+        lambda i: asyncio.run(main.single_flight("coalesce", call)), 3
+    )
+
+    assert errors == [None, None, None]
+    assert results == ["summary", "summary", "summary"]
+    assert len(calls) == 1
+    assert "coalesce" not in main.get_inflight()[0]
+
+
+def test_single_flight_follower_cancellation_does_not_cancel_leader():
+    async def call():
+        await asyncio.sleep(0.3)
+        return "summary"
+
+    async def impatient():
+        return await asyncio.wait_for(main.single_flight("cancel", call), timeout=0.05)
+
+    def target(i):
+        if i == 0:
+            return asyncio.run(main.single_flight("cancel", call))
+        if i == 1:
+            return asyncio.run(impatient())
+        return asyncio.run(main.single_flight("cancel", call))
+
+    results, errors = run_in_threads(target, 3)
+
+    assert isinstance(errors[1], asyncio.TimeoutError)
+    assert results[0] == "summary" and errors[0] is None
+    assert results[2] == "summary" and errors[2] is None
+
+
+def test_single_flight_follower_retries_when_leader_is_cancelled():
+    calls = []
+
+    async def call():
+        calls.append(1)
+        await asyncio.sleep(0.2)
+        return "summary"
+
+    async def cancelled_leader():
+        return await asyncio.wait_for(main.single_flight("retry", call), timeout=0.05)
+
+    def target(i):
+        if i == 0:
+            return asyncio.run(cancelled_leader())
+        return asyncio.run(main.single_flight("retry", call))
+
+    results, errors = run_in_threads(target, 2)
+
+    assert isinstance(errors[0], asyncio.TimeoutError)
+    assert results[1] == "summary" and errors[1] is None
+    assert len(calls) == 2
+
+
+def test_single_flight_shares_leader_errors():
+    async def call():
+        await asyncio.sleep(0.2)
+        raise ValueError("rate limited")
+
+    results, errors = run_in_threads(
+        lambda i: asyncio.run(main.single_flight("error", call)), 2
+    )
+
+    assert all(isinstance(e, ValueError) for e in errors)
+    assert "error" not in main.get_inflight()[0]
+
+
+def test_stream_cached_coalesces_identical_prompts(monkeypatch):
+    calls = []
+
+    def create(**kwargs):
+        calls.append(kwargs)
+        for text in ["Hello", " world"]:
+            time.sleep(0.1)
+            yield SimpleNamespace(
+                choices=[SimpleNamespace(delta=SimpleNamespace(content=text))]
+            )
+
+    client = SimpleNamespace(chat=SimpleNamespace(completions=SimpleNamespace(create=create)))
+    monkeypatch.setattr(main, "get_client", lambda: client)
+    monkeypatch.setattr(main, "cache_get", lambda key: None)
+    monkeypatch.setattr(main, "cache_set", lambda key, content: None)
+
+    results, errors = run_in_threads(
+        lambda i: "".join(main.stream_cached("same prompt", "model")), 2
+    )
+
+    assert errors == [None, None]
+    assert results == ["Hello world", "Hello world"]
+    assert len(calls) == 1
+
+
+@pytest.fixture
+def response_cache(monkeypatch, tmp_path):
+    monkeypatch.setattr(main, "RESPONSE_CACHE_PATH", str(tmp_path / "cache" / "responses.db"))
+    main.get_response_cache.clear()
+    yield
+    main.get_response_cache.clear()
+
+
+def test_response_cache_round_trip_and_prunes_expired_rows(response_cache, monkeypatch):
+    main.cache_set("old", "stale")
+    assert main.cache_get("old") == "stale"
+
+    later = time.time() + main.RESPONSE_CACHE_TTL + 1
+    monkeypatch.setattr(main.time, "time", lambda: later)
+    main.cache_set("new", "fresh")
+
+    conn, _ = main.get_response_cache()
+    keys = [row[0] for row in conn.execute("SELECT key FROM responses")]
+    assert keys == ["new"]
+
+
+def test_response_cache_unusable_path_is_a_miss(monkeypatch, tmp_path):
+    blocker = tmp_path / "not_a_dir"
+    blocker.write_text("")
+    monkeypatch.setattr(main, "RESPONSE_CACHE_PATH", str(blocker / "responses.db"))
+    main.get_response_cache.clear()
+    try:
+        main.cache_set("key", "value")
+        assert main.cache_get("key") is None
+    finally:
+        main.get_response_cache.clear()
+
+
+class FakeAsyncGroq:
+    """Answers chunk prompts with the chunk's first word and merges as "(a+b)"."""
+
+    def __init__(self, prompts):
+        self.prompts = prompts
+        self.chat = SimpleNamespace(completions=SimpleNamespace(create=self.create))
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, *exc):
+        return False
+
+    async def create(self, model, messages, **kwargs):
+        prompt = messages[0]["content"]
+        self.prompts.append(prompt)
+        body = prompt.split("summary:\n", 1)[1]
+        if prompt.startswith("Merge"):
+            a, b = body.split("\n\n---\n\n")
+            content = f"({a}+{b})"
+        elif body.startswith("fail"):
+            raise ValueError("rate limited")
+        else:
+            content = body.split()[0]
+        return SimpleNamespace(choices=[SimpleNamespace(message=SimpleNamespace(content=content))])
+
+
+@pytest.fixture
+def fake_groq(monkeypatch):
+    prompts = []
+    final_prompts = []
+
+    def create(**kwargs):
+        final_prompts.append(kwargs["messages"][0]["content"])
+        yield SimpleNamespace(choices=[SimpleNamespace(delta=SimpleNamespace(content="report"))])
+
+    client = SimpleNamespace(chat=SimpleNamespace(completions=SimpleNamespace(create=create)))
+    monkeypatch.setattr(main, "make_async_client", lambda: FakeAsyncGroq(prompts))
+    monkeypatch.setattr(main, "get_client", lambda: client)
+    monkeypatch.setattr(main, "cache_get", lambda key: None)
+    monkeypatch.setattr(main, "cache_set", lambda key, content: None)
+    return SimpleNamespace(prompts=prompts, final_prompts=final_prompts)
+
+
+def test_iter_chunks_slices_original_text():
+    assert list(main.iter_chunks("a b  c\nd e", 2)) == ["a b", "c\nd", "e"]
+    assert list(main.iter_chunks("   ", 2)) == []
+
+
+def test_split_captions_keeps_short_transcripts_whole():
+    captions = "word " * 100
+    assert main.split_captions(captions, "llama3-8b-8192", 1000) == [captions]
+
+
+def test_split_captions_clamps_chunks_to_model_budget():
+    budget = main.input_word_budget("llama3-8b-8192", 0)
+    chunks = main.split_captions("word " * 9000, "llama3-8b-8192", 10000)
+
+    assert len(chunks) == 3
+    assert max(main.count_words(chunk) for chunk in chunks) == budget
+
+
+def test_merge_summaries_builds_pairwise_tree(fake_groq):
+    leaves = list("abcdefghi")
+
+    assert asyncio.run(main.merge_summaries(leaves, "model", fanin=1)) == [
+        "((((a+b)+(c+d))+((e+f)+(g+h)))+i)"
+    ]
+    assert asyncio.run(main.merge_summaries(leaves, "model", fanin=4)) == [
+        "((a+b)+(c+d))",
+        "((e+f)+(g+h))",
+        "i",
+    ]
+
+
+def test_build_report_prompt_single_chunk_skips_map_step(fake_groq):
+    prompt = main.build_report_prompt("url", {}, ["the captions"], "model", 100)
+
+    assert prompt == main.build_single_prompt("the captions")
+    assert fake_groq.prompts == []
+
+
+def test_build_report_prompt_maps_merges_and_reports_chunks(fake_groq):
+    seen = []
+    chunks = ["one x", "two x", "three x", "four x", "five x"]
+
+    prompt = main.build_report_prompt(
+        "url", {}, chunks, "llama3-8b-8192", 100, on_chunks=seen.append
+    )
+
+    assert seen == [["one", "two", "three", "four", "five"]]
+    assert "Video URL: url" in prompt
+    assert "Chunk 1:\n\n(one+two)" in prompt
+    assert "Chunk 2:\n\n(three+four)" in prompt
+    assert "Chunk 3:\n\nfive" in prompt
+
+
+def test_build_report_prompt_raises_on_failed_chunk(fake_groq):
+    with pytest.raises(RuntimeError, match="1 of 2 chunks"):
+        main.build_report_prompt("url", {}, ["one x", "fail x"], "model", 100)
+    assert not any(prompt.startswith("Merge") for prompt in fake_groq.prompts)
+
+
+def test_summarize_video_continues_without_metadata(fake_groq, monkeypatch):
+    def no_metadata(url):
+        raise ValueError("Error getting video data: offline")
+
+    # A context window that takes 300 words of input per call
+    ctx = main.MAX_OUTPUT_TOKENS + main.PROMPT_OVERHEAD_TOKENS + int(300 * main.TOKENS_PER_WORD)
+    monkeypatch.setitem(main.MODEL_CTX, "test-model", ctx)
+    monkeypatch.setattr(main, "fetch_video_data", no_metadata)
+    monkeypatch.setattr(main, "fetch_captions", lambda url: " ".join(f"w{i}" for i in range(500)))
+
+    assert main.summarize_video("url", model="test-model", chunk_words=100) == "report"
+    assert "Video Data: {}" in fake_groq.final_prompts[0]
+    assert "(w0+w100)" in fake_groq.final_prompts[0]
+    assert "(w200+w300)" in fake_groq.final_prompts[0]
+
+
+class FakeStream:
+    def __init__(self, texts):
+        self.texts = texts
+        self.closed = False
+
+    def __iter__(self):
+        for text in self.texts:
+            yield SimpleNamespace(choices=[SimpleNamespace(delta=SimpleNamespace(content=text))])
+
+    def close(self):
+        self.closed = True
+
+
+def test_stream_cached_closes_stream_when_abandoned(monkeypatch):
+    stream = FakeStream(["Hello", " world"])
+    client = SimpleNamespace(
+        chat=SimpleNamespace(completions=SimpleNamespace(create=lambda **kwargs: stream))
+    )
+    monkeypatch.setattr(main, "get_client", lambda: client)
+    monkeypatch.setattr(main, "cache_get", lambda key: None)
+    monkeypatch.setattr(main, "cache_set", lambda key, content: None)
+
+    gen = main.stream_cached("abandoned prompt", "model")
+    assert next(gen) == "Hello"
+    gen.close()
+
+    assert stream.closed
+    assert main.hash_request("abandoned prompt", "model") not in main.get_inflight()[0]
+
+
+def test_stream_cached_takes_over_from_stalled_leader(monkeypatch):
+    stream = FakeStream(["fresh"])
+    client = SimpleNamespace(
+        chat=SimpleNamespace(completions=SimpleNamespace(create=lambda **kwargs: stream))
+    )
+    monkeypatch.setattr(main, "get_client", lambda: client)
+    monkeypatch.setattr(main, "cache_get", lambda key: None)
+    monkeypatch.setattr(main, "cache_set", lambda key, content: None)
+    monkeypatch.setattr(main, "INFLIGHT_WAIT_SECONDS", 0.1)
+
+    key = main.hash_request("stalled prompt", "model")
+    stalled, leader = main.claim_inflight(key)
+    assert leader
+
+    assert "".join(main.stream_cached("stalled prompt", "model")) == "fresh"
+    assert key not in main.get_inflight()[0]
+
+    # The stalled leader finishing late must not disturb anyone
+    main.resolve_inflight(key, stalled, "late")
+
+
+def test_single_flight_takes_over_from_stalled_leader(monkeypatch):
+    monkeypatch.setattr(main, "INFLIGHT_WAIT_SECONDS", 0.1)
+    stalled, leader = main.claim_inflight("stalled")
+    assert leader
+
+    async def call():
+        return "fresh"
+
+    assert asyncio.run(main.single_flight("stalled", call)) == "fresh"
+    assert "stalled" not in main.get_inflight()[0]
+    main.resolve_inflight("stalled", stalled, "late")